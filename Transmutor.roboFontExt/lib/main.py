@@ -26,12 +26,14 @@
 import math
 import os
 import site
-from copy import deepcopy
+import time
+from collections import OrderedDict
 
+import AppKit
 import ezui
 from mojo.events import EditingTool, getActiveEventTool
-from mojo.roboFont import version
-from mojo.subscriber import Subscriber, registerRoboFontSubscriber
+from mojo.subscriber import Subscriber, registerRoboFontSubscriber, unregisterRoboFontSubscriber, listRegisteredSubscribers
+from mojo.tools import CallbackWrapper
 from mojo.tools import IntersectGlyphWithLine as intersect
 from mojo.UI import CurrentGlyphWindow, getDefault
 
@@ -48,63 +50,105 @@
 VERBOSE = False
 EXTENSION_IDENTIFIER = "co.ohnotype.Transmutor"
 VERSION = "2.0.3"
-
-def verbosePrint(s):
-    if VERBOSE:
+SCALED_GLYPH_CACHE_SIZE = 32
+SCALER_CACHE_SIZE = 4
+MEMOIZE_CACHE_SIZE = 256
+# minimum number of seconds between two redraws, about one frame
+REDRAW_DELAY = 0.016
+# the glyphs mutatorScale's getRefStems measures the masters' stems on
+STEM_REFERENCE_GLYPHS = ("I", "H")
+
+HANDLE_SIZE = 10
+BOX_DASH = (5, 5)
+# (name, x, y) of each handle, as a factor of the scaled glyph's bounds
+HANDLE_SPECS = (
+    ("sw", 0.0, 0.0),
+    ("s", 0.5, 0.0),
+    ("se", 1.0, 0.0),
+    ("e", 1.0, 0.5),
+    ("ne", 1.0, 1.0),
+    ("n", 0.5, 1.0),
+    ("nw", 0.0, 1.0),
+    ("w", 0.0, 0.5),
+)
+
+if VERBOSE:
+    def verbosePrint(s):
         print(s)
+else:
+    # every event handler calls this, keep it as cheap as possible when not debugging
+    def verbosePrint(s):
+        pass
 
 
 def disable(klass):
     return False
 
 
-enable = deepcopy(getActiveEventTool().__class__.canSelectWithMarque)
+# the tool's own canSelectWithMarque, restored after Transmutor has temporarily disabled marquee selection
+enable = getActiveEventTool().__class__.canSelectWithMarque
 
-_memoizeCache = dict()
+_memoizedFunctions = []
 
 
 def clearMemoizeCache():
     # clears all memoized caches
     # this is intended as the usage of memoize is made per context
-    _memoizeCache.clear()
+    for function in _memoizedFunctions:
+        function.cache_clear()
 
 
 def cache(function):
     """
     Memoize a function's return value with the function's arguments.
     The next time a function is called with the same arguments, the cache is returned.
+    This is a thin wrapper around functools.lru_cache, so the arguments need to be hashable.
     Example usage:
         @cache
         def addNumbers(first, second):
             return first + second
         # The first time this function is called the calculation will be made,
-        # and and the result will be stored in the cache dict as [first, second]: returnValue
+        # and and the result will be stored in the function's lru_cache
         # From then on, this value will be returned when the same argument is made to the addNumbers function
     """
-    @functools.wraps(function)
-    def wrapper(*args, **kwargs):
-        key = (function, args, frozenset(kwargs.items()))
-        if key in _memoizeCache:
-            return _memoizeCache[key]
-        else:
-            result = function(*args, **kwargs)
-            _memoizeCache[key] = result
-            return result
+    wrapper = functools.lru_cache(maxsize=MEMOIZE_CACHE_SIZE)(function)
+    _memoizedFunctions.append(wrapper)
     return wrapper
 
 
-def distance(p1, p2):
-    return round(math.sqrt((p1[0]-p2[0])**2 + (p1[1]-p2[1])**2), 2)
-
-
-def interpolate(a, b, v):
-    return a + (b - a) * v
+def measureSpans(spans):
+    # returns the midpoint and rounded length of every (front, back) span in one pass
+    return [(((fx + bx) * 0.5, (fy + by) * 0.5), round(math.hypot(bx - fx, by - fy), 2))
+            for (fx, fy), (bx, by) in spans]
 
 
 def norm(v, a, b):
     return (v - a) / (b - a)
 
 
+def lineMissesBounds(sx, sy, ex, ey, bounds):
+    # True when the segment from (sx, sy) to (ex, ey) can't touch the bounds box
+    x0, y0, x1, y1 = bounds
+    if max(sx, ex) < x0 or min(sx, ex) > x1 or max(sy, ey) < y0 or min(sy, ey) > y1:
+        return True
+    # a diagonal line can still pass beside the box, then all its corners are on the same side of the line
+    dx, dy = ex - sx, ey - sy
+    sides = [dx * (cy - sy) - dy * (cx - sx) for cx, cy in ((x0, y0), (x1, y0), (x1, y1), (x0, y1))]
+    return min(sides) > 0 or max(sides) < 0
+
+
+def interpolateBounds(bounds, origin):
+    # the point at origin (as a factor of the width and height) within bounds
+    x0, y0, x1, y1 = bounds
+    return x0 + (x1 - x0) * origin[0], y0 + (y1 - y0) * origin[1]
+
+
+def originShift(bounds, origin, newOrigin):
+    # how far the offset has to move so the glyph stays in place when its transform origin changes
+    x0, y0, x1, y1 = bounds
+    return (x1 - x0) * (newOrigin[0] - origin[0]), (y1 - y0) * (newOrigin[1] - origin[1])
+
+
 @cache
 def getRefStemsCached(font):
     return getRefStems(font)
@@ -132,6 +176,19 @@ class TransmutorModel():
 
     transformOrigin = (0.5, 0.5)
 
+    def __init__(self):
+        self._scaledCache = OrderedDict()
+        self._scalers = OrderedDict()
+        self._unScaledCache = OrderedDict()
+        self._baseVStem = 0
+        self._baseHStem = 0
+        self._scalerSettings = None
+        self._scalerFontIds = ()
+        self._lastScaledKey = None
+        self._lastScaledGlyph = None
+        self._handlePositions = ()
+        self._handlePositionsBounds = None
+
     @property
     def scaledGlyphColor(self):
         verbosePrint("TransmutorModel::scaledGlyphColor")
@@ -152,51 +209,172 @@ def use45Constraint(self):
         verbosePrint("TransmutorModel::use45Constraint")
         return getDefault("glyphViewShouldUse45Contrain")
 
+    def getState(self):
+        # everything the user changes interactively, used to skip redraws when nothing changed
+        return (self.offsetX, self.offsetY, self.transformOrigin,
+                self.scaleV, self.scaleH, self.stemWtRatioV, self.stemWtRatioH)
+
+    def setState(self, *state):
+        # Takes the values in getState() order, returns whether anything changed
+        if state == self.getState():
+            return False
+        (self.offsetX, self.offsetY, self.transformOrigin,
+         self.scaleV, self.scaleH, self.stemWtRatioV, self.stemWtRatioH) = state
+        return True
+
     def updateScaler(self):
-        if self.allFonts:
-            self.scaler = MutatorScaleEngine(self.activeFonts)
+        # This runs on every glyph switch, only rebuild the engine when the active fonts changed
+        fontIds = tuple(id(font) for font in self.activeFonts)
+        if self.scaler is None or fontIds != self._scalerFontIds:
+            if self.allFonts:
+                # switching back to an earlier selection of fonts reuses the engine built for it
+                if fontIds in self._scalers:
+                    self._scalers.move_to_end(fontIds)
+                    self.scaler = self._scalers[fontIds]
+                else:
+                    self.scaler = MutatorScaleEngine(self.activeFonts)
+                    self._scalers[fontIds] = self.scaler
+                    if len(self._scalers) > SCALER_CACHE_SIZE:
+                        self._scalers.popitem(last=False)
+                self._scalerSettings = None
+            # part of every scaled glyph key, the fonts only change together with the scaler
+            self._scalerFontIds = fontIds
+            self.clearScaledGlyphCache()
+        self.updateBaseStems()
+
+    def invalidateScaler(self, font):
+        # The engines measure the masters when they are built, so every engine built from
+        # the edited font has to go. Returns whether the current one was among them,
+        # then the next updateScaler builds it again
+        fontIds = {id(f) for f in self.allFonts if f == font}
+        for key in [key for key in self._scalers if fontIds.intersection(key)]:
+            del self._scalers[key]
+        if fontIds.intersection(self._scalerFontIds):
+            self.scaler = None
+            return True
+        return False
+
+    def clearScalerCache(self):
+        # the cached engines hold on to their fonts
+        self._scalers.clear()
+
+    def updateBaseStems(self):
+        # The reference stems only depend on the scaler's masters and the current font,
+        # so they are looked up here instead of on every getScaledGlyph call
+        self._baseVStem, self._baseHStem = 0, 0
+        if self.scaler is not None and self.currentFont is not None:
+            masters = self.scaler.masters
+            master = masters.get(makeListFontNameCached(self.currentFont)) or next(iter(masters.values()), None)
+            if master is not None:
+                self._baseVStem, self._baseHStem = master.vstem, master.hstem
+
+    def setScalerSettings(self, width, targetHeight, referenceHeight):
+        # MutatorScale recomputes its instance on every set(), so skip it when the settings are already applied
+        settings = (width, targetHeight, referenceHeight)
+        if settings != self._scalerSettings:
+            self.scaler.set({
+                "width": width,
+                "targetHeight": targetHeight,
+                "referenceHeight": referenceHeight,
+            })
+            self._scalerSettings = settings
+
+    def clearScaledGlyphCache(self):
+        self._scaledCache.clear()
+        self._unScaledCache.clear()
+        self._lastScaledKey = None
+        self._lastScaledGlyph = None
+
+    def getHandlePositions(self):
+        # (name, u, v, x, y) of every handle, computed once per scaledGlyphBounds
+        if self._handlePositionsBounds != self.scaledGlyphBounds:
+            bx0, by0, bx1, by1 = self.scaledGlyphBounds
+            w, h = bx1 - bx0, by1 - by0
+            self._handlePositions = tuple((name, u, v, bx0 + w * u, by0 + h * v) for name, u, v in HANDLE_SPECS)
+            self._handlePositionsBounds = self.scaledGlyphBounds
+        return self._handlePositions
+
+    def getLastScaledGlyph(self, validate=True, key=None):
+        # Returns the glyph the last redraw produced, when the model hasn't changed since.
+        # Callers that know only the offset changed can skip building the key with validate=False,
+        # callers that already built the key can pass it in
+        if self._lastScaledGlyph is not None:
+            if not validate:
+                return self._lastScaledGlyph
+            if key is None:
+                key = self.scaledGlyphKey()
+            if self._lastScaledKey == key:
+                return self._lastScaledGlyph
+        return self.getScaledGlyph()
+
+    def scaledGlyphKey(self):
+        # Float values are rounded so that slider ticks landing on the same value hit the cache
+        return (self.sourceGlyphName,
+                id(self.currentFont),
+                self._scalerFontIds,
+                round(self.stemWtRatioV, 4),
+                round(self.stemWtRatioH, 4),
+                round(self.scaleV, 4),
+                round(self.scaleH, 4),
+                self.transformOrigin)
 
     def getScaledGlyph(self):
+        # The returned glyph is shared with the cache, copy it before changing it
         verbosePrint("TransmutorModel::getScaledGlyph")
-        if self.currentFont is not None and self.currentGlyph is not None:
-            if self.sourceGlyphName != self.currentGlyph.name and self.sourceGlyphName in self.currentFont.keys():
-                currentFontName = makeListFontNameCached(self.currentFont)
-                if currentFontName in self.scaler.masters:
-                    stems = (self.scaler.masters[currentFontName].vstem * self.stemWtRatioV,
-                             self.scaler.masters[currentFontName].hstem * self.stemWtRatioH)
-                elif len(self.scaler.masters):
-                    stems = (self.scaler.masters[list(self.scaler.masters.keys())[0]].vstem * self.stemWtRatioV,
-                             self.scaler.masters[list(self.scaler.masters.keys())[0]].hstem * self.stemWtRatioH)
-                else:
-                    stems = (0, 0)
+        # set again below when there is a glyph, getLastScaledGlyph mustn't hand out an outdated one
+        self._lastScaledKey = self._lastScaledGlyph = None
+        name = self.sourceGlyphName
+        if not name or self.currentFont is None or self.currentGlyph is None:
+            return None
+        if name == self.currentGlyph.name or name not in self.currentFont:
+            return None
+
+        key = self.scaledGlyphKey()
+        if key in self._scaledCache:
+            self._scaledCache.move_to_end(key)
+            newGlyph, self.scaledGlyphBounds, self.unScaledGlyphBounds = self._scaledCache[key]
+            self._lastScaledKey, self._lastScaledGlyph = key, newGlyph
+            return newGlyph
+
+        stems = (self._baseVStem * self.stemWtRatioV, self._baseHStem * self.stemWtRatioH)
+
+        upem = self.currentFont.info.unitsPerEm
+
+        # The unscaled bounds don't depend on the scale or the origin,
+        # so changing either only needs the second pass
+        unScaledKey = (self.sourceGlyphName, stems, upem, key[2])
+        if unScaledKey in self._unScaledCache:
+            self._unScaledCache.move_to_end(unScaledKey)
+            unScaledBounds = self._unScaledCache[unScaledKey]
+        else:
+            self.setScalerSettings(1, upem, upem)
+            unScaledBounds = self._unScaledCache[unScaledKey] = self.scaler.getScaledGlyph(self.sourceGlyphName, stems).bounds
+            if len(self._unScaledCache) > SCALED_GLYPH_CACHE_SIZE:
+                self._unScaledCache.popitem(last=False)
 
-                self.scaler.set({
-                    "width": 1,
-                    "targetHeight": self.currentFont.info.unitsPerEm,
-                    "referenceHeight": self.currentFont.info.unitsPerEm,
-                })
+        # an empty glyph (a space) has nothing to draw, no box and no handles
+        if unScaledBounds is None:
+            return None
+        x0, y0, x1, y1 = unScaledBounds
 
-                unScaledGlyph = self.scaler.getScaledGlyph(self.sourceGlyphName, stems)
-                originPt = (interpolate(unScaledGlyph.bounds[0], unScaledGlyph.bounds[2], self.transformOrigin[0]),
-                            interpolate(unScaledGlyph.bounds[1], unScaledGlyph.bounds[3], self.transformOrigin[1]))
-                unScaledGlyph.moveBy((-originPt[0], -originPt[1]))
-                self.unScaledGlyphBounds = unScaledGlyph.bounds
+        # Only the bounds of the unscaled glyph are used, shift them instead of moving its points
+        dx, dy = interpolateBounds((x0, y0, x1, y1), self.transformOrigin)
+        self.unScaledGlyphBounds = (x0 - dx, y0 - dy, x1 - dx, y1 - dy)
 
-                self.scaler.set({
-                    "width": self.scaleH/self.scaleV,
-                    "targetHeight": self.currentFont.info.unitsPerEm * self.scaleV,
-                    "referenceHeight": self.currentFont.info.unitsPerEm,
-                })
+        self.setScalerSettings(self.scaleH/self.scaleV, upem * self.scaleV, upem)
 
-                newGlyph = self.scaler.getScaledGlyph(self.sourceGlyphName, stems)
-                originPt = (interpolate(newGlyph.bounds[0], newGlyph.bounds[2], self.transformOrigin[0]),
-                            interpolate(newGlyph.bounds[1], newGlyph.bounds[3], self.transformOrigin[1]))
-                newGlyph.moveBy((-originPt[0], -originPt[1]))
-                self.scaledGlyphBounds = newGlyph.bounds
+        newGlyph = self.scaler.getScaledGlyph(self.sourceGlyphName, stems)
+        x0, y0, x1, y1 = newGlyph.bounds
+        dx, dy = interpolateBounds((x0, y0, x1, y1), self.transformOrigin)
+        newGlyph.moveBy((-dx, -dy))
+        self.scaledGlyphBounds = (x0 - dx, y0 - dy, x1 - dx, y1 - dy)
 
-                return newGlyph
+        self._scaledCache[key] = (newGlyph, self.scaledGlyphBounds, self.unScaledGlyphBounds)
+        if len(self._scaledCache) > SCALED_GLYPH_CACHE_SIZE:
+            self._scaledCache.popitem(last=False)
 
-        return None
+        self._lastScaledKey, self._lastScaledGlyph = key, newGlyph
+        return newGlyph
 
 
 class TransmutorToolController(Subscriber, ezui.WindowController):
@@ -207,6 +385,29 @@ class TransmutorToolController(Subscriber, ezui.WindowController):
     optionDown = False
     shiftDown = False
 
+    _geometryLayers = []
+    _scaledGlyphLayer = None
+    _previewLayer = None
+    _boxLayer = None
+    _handleLayers = {}
+    _measurementsLayer = None
+    _geometryKey = None
+    _geometryOffset = None
+    _redrawTimer = None
+    _invDampener = 1.0 / 200.0
+    _lastRedrawTime = 0.0
+    _measurements = ()
+    _measurementsKey = None
+    _measurementSublayers = []
+    _visibleMeasurementCount = 0
+    _contourBounds = None
+    _handleImageSettings = None
+    _measurementImageSettings = None
+    _sourceFontTableKey = None
+    _sliderValues = None
+    _measurementsDirty = True
+    _currentGlyphEdited = False
+
     # Build, Destroy, Etc.
     #############################################################
 
@@ -366,17 +567,27 @@ def started(self):
                 self.previewContainer.setVisible(True)
 
                 self.model = TransmutorModel()
+                self.loadDefaults()
+                self._redrawTimerTarget = CallbackWrapper(self._redrawTimerFired)
                 
                 # self.model.setInitialActive()
 
                 self.active = True
                 self.userHasMovedGlyph = False
 
-                self.reset()
+                self.loadFonts()
 
                 self.w.open()
                 self.w.getNSWindow().makeKeyWindow()
 
+                # Building the scaler and reading every font's stems takes a moment,
+                # show the panel first and fill it in on the next pass of the run loop
+                AppKit.NSOperationQueue.mainQueue().addOperationWithBlock_(self._initialReset)
+
+    def _initialReset(self):
+        if self.active:
+            self.reset()
+
     def destroy(self):
         verbosePrint("TransmutorToolController::destroy")
         if self.active:
@@ -385,8 +596,8 @@ def destroy(self):
             self.foregroundContainer.setVisible(False)
             self.previewContainer.setVisible(False)
 
-            self.foregroundContainer.clearSublayers()
-            self.previewContainer.clearSublayers()
+            self.cancelScheduledRedraw()
+            self.clearLayers()
 
             # if self.w:
             #     self.w.close()
@@ -399,12 +610,47 @@ def destroy(self):
     # State Management Functions
     #############################################################
 
+    def loadDefaults(self):
+        verbosePrint("TransmutorToolController::loadDefaults")
+        # getDefault crosses into NSUserDefaults, so the colors are read once and reused on every redraw
+        self._scaledGlyphColor = self.model.scaledGlyphColor
+        self._previewColor = self.model.previewColor
+        self._textColor = self.model.textColor
+        self._use45Constraint = self.model.use45Constraint
+
+        # the symbol settings only depend on the colors, build them once for every handle and measurement point
+        self._handleImageSettings = dict(
+            name="rectangle",
+            size=(HANDLE_SIZE, HANDLE_SIZE),
+            fillColor=self._scaledGlyphColor
+        )
+        self._measurementImageSettings = dict(
+            name="oval",
+            size=(HANDLE_SIZE*0.5, HANDLE_SIZE*0.5),
+            fillColor=self._scaledGlyphColor
+        )
+
+    def loadFonts(self):
+        verbosePrint("TransmutorToolController::loadFonts")
+        # The font list is only read once, fontDocumentDidOpen/WillClose keep it up to date afterwards
+        self.model.allFonts = list(AllFonts(sortOptions=["magic"]))
+        self.model.activeFonts = [font for font in self.model.allFonts if font.info.familyName]
+        # the table rows are built from the memoized names and stems on the next refresh
+        self._sourceFontTableKey = None
+        self.observeFonts()
+
+    def observeFonts(self):
+        # edits to the source fonts are reported through adjunctFontDidChange
+        self.setAdjunctObjectsToObserve(list(self.model.allFonts))
+
     def reset(self):
         verbosePrint("TransmutorToolController::reset")
         self.model.currentFont = CurrentFont()
         self.model.currentGlyph = CurrentGlyph()
-        self.model.allFonts = [font for font in AllFonts(sortOptions=["magic"])]
-        self.model.activeFonts = [font for font in self.model.allFonts if font.info.familyName]
+        self.model.clearScaledGlyphCache()
+        # the measurements belong to the current glyph, read them again
+        self._measurementsDirty = True
+        self._measurementsKey = None
 
         self.model.updateScaler()
         self.redrawView()
@@ -417,7 +663,11 @@ def clearSelection(self):
 
     def addToGlyph(self):
         verbosePrint("TransmutorToolController::addToGlyph")
-        scaledGlyph = self.model.getScaledGlyph()
+        self.flushRedraw()
+        scaledGlyph = self.model.getLastScaledGlyph()
+        if scaledGlyph is None:
+            return
+        scaledGlyph = scaledGlyph.copy()
         scaledGlyph.moveBy((self.model.offsetX, self.model.offsetY))
         scaledGlyph.round()
         with self.model.currentGlyph.undo("Transmutor"):
@@ -425,202 +675,277 @@ def addToGlyph(self):
 
     def refreshFromModel(self):
         verbosePrint("TransmutorToolController::refreshFromModel")
-        self.w.getItem("stemWtRatioVSlider").set(self.model.stemWtRatioV)
-        self.w.getItem("stemWtRatioHSlider").set(self.model.stemWtRatioH)
-
-        self.w.getItem("scaleVSlider").set(self.model.scaleV)
-        self.w.getItem("scaleHSlider").set(self.model.scaleH)
-
-        if len(self.w.getItemValue("sourceFontTable")) > 0:
-            self.w.getItem("sourceFontTable").set([])
-            
+        # only push values into the sliders when the model changed them,
+        # moving the glyph or dragging a slider itself doesn't need to touch them
+        sliderValues = (self.model.stemWtRatioV, self.model.stemWtRatioH, self.model.scaleV, self.model.scaleH)
+        if sliderValues != self._sliderValues:
+            self._sliderValues = sliderValues
+            self.stemWtRatioVSlider.set(self.model.stemWtRatioV)
+            self.stemWtRatioHSlider.set(self.model.stemWtRatioH)
+
+            self.scaleVSlider.set(self.model.scaleV)
+            self.scaleHSlider.set(self.model.scaleH)
+
+        # the table only needs to be rebuilt when fonts were opened, closed or toggled
+        tableKey = self.sourceFontTableKey()
+        if tableKey == self._sourceFontTableKey:
+            return
+        previousKey = self._sourceFontTableKey
+        self._sourceFontTableKey = tableKey
+
+        activeFontIds = {id(font) for font in self.model.activeFonts}
+        table = self.w.getItem("sourceFontTable")
+        if previousKey is not None and previousKey[0] == tableKey[0]:
+            # same fonts, only the selection changed, keep the existing rows
+            items = table.get()
+            for item, font in zip(items, self.model.allFonts):
+                item["selected"] = id(font) in activeFontIds
+            table.set(items)
+            return
+
+        # build all the rows first so the table only reloads once
+        items = []
         for font in self.model.allFonts:
             vStem, hStem = getRefStemsCached(font)
-            self.w.getItem("sourceFontTable").appendItems([{
-                "selected": (font in self.model.activeFonts),
+            items.append({
+                "selected": (id(font) in activeFontIds),
                 "font": makeListFontNameCached(font),
                 "vStem": vStem,
                 "hStem": hStem,
-            }])
+            })
+        table.set(items)
+
+    def sourceFontTableKey(self):
+        return (tuple(id(font) for font in self.model.allFonts),
+                tuple(id(font) for font in self.model.activeFonts))
 
     def redrawView(self):
         verbosePrint("TransmutorToolController::redrawView")
-        self.foregroundContainer.clearSublayers()
-        self.previewContainer.clearSublayers()
-
+        self._lastRedrawTime = time.monotonic()
+        scaledGlyph = None
         if self.model.sourceGlyphName:
-            scaledGlyph = self.model.getScaledGlyph()
-
-            if scaledGlyph is not None:
-                scaledGlyphLayer = self.foregroundContainer.appendPathSublayer(
-                    fillColor=self.model.scaledGlyphColor,
-                    strokeColor=None,
-                    opacity=0.5
-                )
-                pen = scaledGlyphLayer.getPen()
-                scaledGlyph.draw(pen)
-
-                previewLayer = self.previewContainer.appendPathSublayer(
-                    fillColor=self.model.previewColor,
-                    strokeColor=None,
-                    opacity=1,
-                )
-                pen = previewLayer.getPen()
-                scaledGlyph.draw(pen)
-
-                boxLayer = self.foregroundContainer.appendPathSublayer(
-                    fillColor=None,
-                    strokeColor=self.model.scaledGlyphColor,
-                    strokeWidth=1,
-                    name="box"
-                )
-                pen = boxLayer.getPen()
-                # bounds (x, y, w, h)
-                pen.moveTo((self.model.scaledGlyphBounds[0], self.model.scaledGlyphBounds[1]))
-                pen.lineTo((self.model.scaledGlyphBounds[2], self.model.scaledGlyphBounds[1]))
-                pen.lineTo((self.model.scaledGlyphBounds[2], self.model.scaledGlyphBounds[3]))
-                pen.lineTo((self.model.scaledGlyphBounds[0], self.model.scaledGlyphBounds[3]))
-                pen.closePath()
-                boxLayer.setStrokeDash((5, 5))
-
-                handleSize = 10
-
-                swHandleLayer = self.foregroundContainer.appendSymbolSublayer(
-                    position=(self.model.scaledGlyphBounds[0], self.model.scaledGlyphBounds[1]),
-                    imageSettings=dict(
-                        name="rectangle",
-                        size=(handleSize, handleSize),
-                        fillColor=self.model.scaledGlyphColor
-                    )
-                )
-
-                sHandleLayer = self.foregroundContainer.appendSymbolSublayer(
-                    position=(interpolate(self.model.scaledGlyphBounds[0], self.model.scaledGlyphBounds[2], 0.5), self.model.scaledGlyphBounds[1]),
-                    imageSettings=dict(
-                        name="rectangle",
-                        size=(handleSize, handleSize),
-                        fillColor=self.model.scaledGlyphColor
-                    )
-                )
-
-                seHandleLayer = self.foregroundContainer.appendSymbolSublayer(
-                    position=(self.model.scaledGlyphBounds[2], self.model.scaledGlyphBounds[1]),
-                    imageSettings=dict(
-                        name="rectangle",
-                        size=(handleSize, handleSize),
-                        fillColor=self.model.scaledGlyphColor
-                    )
-                )
+            # the key is needed for the geometry check below as well, build it once
+            geometryKey = self.model.scaledGlyphKey()
+            scaledGlyph = self.model.getLastScaledGlyph(key=geometryKey)
 
-                eHandleLayer = self.foregroundContainer.appendSymbolSublayer(
-                    position=(self.model.scaledGlyphBounds[2], interpolate(self.model.scaledGlyphBounds[1], self.model.scaledGlyphBounds[3], 0.5)),
-                    imageSettings=dict(
-                        name="rectangle",
-                        size=(handleSize, handleSize),
-                        fillColor=self.model.scaledGlyphColor
-                    )
-                )
+        if scaledGlyph is None:
+            self.clearLayers()
+        else:
+            # Only rebuild the glyph, box and handles when the scaled geometry changed,
+            # moving the glyph around just updates the translation of the existing layers
+            if not self._geometryLayers:
+                self.buildGeometryLayers()
+            if geometryKey != self._geometryKey:
+                self.updateGeometryLayers(scaledGlyph)
+                self._geometryKey = geometryKey
+            self.translateGeometryLayers()
+            self.buildMeasurementLayers(scaledGlyph)
 
-                neHandleLayer = self.foregroundContainer.appendSymbolSublayer(
-                    position=(self.model.scaledGlyphBounds[2], self.model.scaledGlyphBounds[3]),
-                    imageSettings=dict(
-                        name="rectangle",
-                        size=(handleSize, handleSize),
-                        fillColor=self.model.scaledGlyphColor
-                    )
-                )
+        self.refreshFromModel()
 
-                nHandleLayer = self.foregroundContainer.appendSymbolSublayer(
-                    position=(interpolate(self.model.scaledGlyphBounds[0], self.model.scaledGlyphBounds[2], 0.5), self.model.scaledGlyphBounds[3]),
-                    imageSettings=dict(
-                        name="rectangle",
-                        size=(handleSize, handleSize),
-                        fillColor=self.model.scaledGlyphColor
-                    )
-                )
+    def scheduleRedraw(self):
+        # Sliders and drags fire far more often than the screen refreshes. Redraw right away
+        # unless the last redraw was less than a frame ago, then redraw the latest state once that frame is over
+        if self._redrawTimer is not None:
+            return
+        elapsed = time.monotonic() - self._lastRedrawTime
+        if elapsed >= REDRAW_DELAY:
+            self.redrawView()
+        else:
+            self._redrawTimer = AppKit.NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+                REDRAW_DELAY - elapsed, self._redrawTimerTarget, "action:", None, False
+            )
+
+    def cancelScheduledRedraw(self):
+        if self._redrawTimer is not None:
+            self._redrawTimer.invalidate()
+            self._redrawTimer = None
+
+    def flushRedraw(self):
+        # redraw right away if a redraw is still waiting on the timer
+        if self._redrawTimer is not None:
+            self.cancelScheduledRedraw()
+            self.redrawView()
 
-                nwHandleLayer = self.foregroundContainer.appendSymbolSublayer(
-                    position=(self.model.scaledGlyphBounds[0], self.model.scaledGlyphBounds[3]),
-                    imageSettings=dict(
-                        name="rectangle",
-                        size=(handleSize, handleSize),
-                        fillColor=self.model.scaledGlyphColor
-                    )
-                )
+    def _redrawTimerFired(self, timer):
+        self._redrawTimer = None
+        if self.active:
+            self.redrawView()
 
-                wHandleLayer = self.foregroundContainer.appendSymbolSublayer(
-                    position=(self.model.scaledGlyphBounds[0], interpolate(self.model.scaledGlyphBounds[1], self.model.scaledGlyphBounds[3], 0.5)),
-                    imageSettings=dict(
-                        name="rectangle",
-                        size=(handleSize, handleSize),
-                        fillColor=self.model.scaledGlyphColor
-                    )
-                )
+    def clearLayers(self):
+        verbosePrint("TransmutorToolController::clearLayers")
+        self.foregroundContainer.clearSublayers()
+        self.previewContainer.clearSublayers()
+        self._geometryLayers = []
+        self._scaledGlyphLayer = self._previewLayer = self._boxLayer = None
+        self._handleLayers = {}
+        self._measurementsLayer = None
+        self._measurementSublayers = []
+        self._visibleMeasurementCount = 0
+        self._measurementsKey = None
+        self._geometryKey = None
+        self._geometryOffset = None
+
+    def buildGeometryLayers(self):
+        # The layers are created once and kept, updateGeometryLayers only redraws their contents
+        verbosePrint("TransmutorToolController::buildGeometryLayers")
+        self.clearLayers()
+
+        # everything drawn in the foreground moves together, so it shares one parent layer
+        # and moving the glyph only translates that layer and the preview
+        contentLayer = self.foregroundContainer.appendBaseSublayer()
+
+        self._scaledGlyphLayer = contentLayer.appendPathSublayer(
+            fillColor=self._scaledGlyphColor,
+            strokeColor=None,
+            opacity=0.5
+        )
 
-                # show measurements from currentGlyph
-                measurements = self.model.currentGlyph.naked().measurements
-
-                for m in measurements:
-                    if m.startPoint and m.endPoint:
-                        sx, sy = m.startPoint
-                        ex, ey = m.endPoint
-
-                        sx -= self.model.offsetX
-                        sy -= self.model.offsetY
-                        ex -= self.model.offsetX
-                        ey -= self.model.offsetY
-
-                        l = (sx, sy), (ex, ey)
-                        i = sorted(intersect(scaledGlyph, l))
-                        inters = [i[ii:ii+2] for ii in range(0, len(i), 2-1)]
-                        for coords in inters:
-                            if len(coords) == 2:
-                                front, back = coords
-                                front = front[0] + self.model.offsetX, front[1] + self.model.offsetY
-                                back = back[0] + self.model.offsetX, back[1] + self.model.offsetY
-
-                                self.foregroundContainer.appendSymbolSublayer(
-                                    position=front,
-                                    imageSettings=dict(
-                                        name="oval",
-                                        size=(handleSize*0.5, handleSize*0.5),
-                                        fillColor=self.model.scaledGlyphColor
-                                    )
-                                )
-                                self.foregroundContainer.appendSymbolSublayer(
-                                    position=back,
-                                    imageSettings=dict(
-                                        name="oval",
-                                        size=(handleSize*0.5, handleSize*0.5),
-                                        fillColor=self.model.scaledGlyphColor
-                                    )
-                                )
-                                xM = interpolate(front[0], back[0], .5)
-                                yM = interpolate(front[1], back[1], .5)
-                                self.foregroundContainer.appendTextLineSublayer(
-                                    position=(xM, yM),
-                                    size=(20, 20),
-                                    pointSize=8,
-                                    weight="bold",
-                                    text=f"{distance(front,back)}",
-                                    fillColor=self.model.textColor,
-                                    horizontalAlignment="center",
-                                    verticalAlignment="center",
-                                )
-
-                scaledGlyphLayer.addTranslationTransformation((self.model.offsetX, self.model.offsetY))
-                previewLayer.addTranslationTransformation((self.model.offsetX, self.model.offsetY))
-                boxLayer.addTranslationTransformation((self.model.offsetX, self.model.offsetY))
-                swHandleLayer.addTranslationTransformation((self.model.offsetX, self.model.offsetY))
-                sHandleLayer.addTranslationTransformation((self.model.offsetX, self.model.offsetY))
-                seHandleLayer.addTranslationTransformation((self.model.offsetX, self.model.offsetY))
-                eHandleLayer.addTranslationTransformation((self.model.offsetX, self.model.offsetY))
-                neHandleLayer.addTranslationTransformation((self.model.offsetX, self.model.offsetY))
-                nHandleLayer.addTranslationTransformation((self.model.offsetX, self.model.offsetY))
-                nwHandleLayer.addTranslationTransformation((self.model.offsetX, self.model.offsetY))
-                wHandleLayer.addTranslationTransformation((self.model.offsetX, self.model.offsetY))
+        self._previewLayer = self.previewContainer.appendPathSublayer(
+            fillColor=self._previewColor,
+            strokeColor=None,
+            opacity=1,
+        )
 
-        self.refreshFromModel()
+        self._boxLayer = contentLayer.appendPathSublayer(
+            fillColor=None,
+            strokeColor=self._scaledGlyphColor,
+            strokeWidth=1,
+            name="box"
+        )
+        self._boxLayer.setStrokeDash(BOX_DASH)
+
+        imageSettings = self._handleImageSettings
+        appendSymbol = contentLayer.appendSymbolSublayer
+        self._handleLayers = {}
+        for name, u, v in HANDLE_SPECS:
+            self._handleLayers[name] = appendSymbol(imageSettings=imageSettings)
+
+        self._geometryLayers = [contentLayer, self._previewLayer]
+
+        # measurements depend on the offset, so they live in their own layer that is updated on every redraw
+        self._measurementsLayer = self.foregroundContainer.appendBaseSublayer()
+
+    def updateGeometryLayers(self, scaledGlyph):
+        verbosePrint("TransmutorToolController::updateGeometryLayers")
+        # getPen() replaces the layer's current path,
+        # the preview shows the same outline so it shares the path instead of drawing the glyph again
+        scaledGlyph.draw(self._scaledGlyphLayer.getPen())
+        self._previewLayer.setPath(self._scaledGlyphLayer.getPath())
+
+        pen = self._boxLayer.getPen()
+        x0, y0, x1, y1 = self.model.scaledGlyphBounds
+        pen.moveTo((x0, y0))
+        pen.lineTo((x1, y0))
+        pen.lineTo((x1, y1))
+        pen.lineTo((x0, y1))
+        pen.closePath()
+
+        handleLayers = self._handleLayers
+        for name, u, v, x, y in self.model.getHandlePositions():
+            handleLayers[name].setPosition((x, y))
+
+        # Used to skip measurement lines that only cross the glyph's box between contours,
+        # components aren't covered by this so glyphs with components are always intersected
+        if scaledGlyph.components:
+            self._contourBounds = None
+        else:
+            self._contourBounds = [contour.bounds for contour in scaledGlyph.contours if contour.bounds]
+
+    def translateGeometryLayers(self):
+        verbosePrint("TransmutorToolController::translateGeometryLayers")
+        offset = (self.model.offsetX, self.model.offsetY)
+        if offset == self._geometryOffset:
+            return
+        # no translation at all is needed while the glyph sits at the origin
+        hadTransformation = self._geometryOffset not in (None, (0, 0))
+        needsTransformation = offset != (0, 0)
+        for layer in self._geometryLayers:
+            if hadTransformation:
+                layer.removeTransformation("offset")
+            if needsTransformation:
+                layer.addTranslationTransformation(offset, name="offset")
+        self._geometryOffset = offset
+
+    def buildMeasurementLayers(self, scaledGlyph):
+        verbosePrint("TransmutorToolController::buildMeasurementLayers")
+        ox, oy = self.model.offsetX, self.model.offsetY
+
+        # the intersections only change with the scaled glyph, the offset or the measurements themselves
+        measurementsKey = (self._geometryKey, ox, oy)
+        if not self._measurementsDirty and measurementsKey == self._measurementsKey:
+            return
+        self._measurementsKey = measurementsKey
+
+        # show measurements from currentGlyph, read as plain (sx, sy, ex, ey) tuples once per glyph change
+        if self._measurementsDirty:
+            self._measurements = [
+                (m.startPoint[0], m.startPoint[1], m.endPoint[0], m.endPoint[1])
+                for m in self.model.currentGlyph.naked().measurements
+                if m.startPoint and m.endPoint
+            ]
+            self._measurementsDirty = False
+
+        # intersect every measurement line with the scaled glyph first,
+        # then compute the distances and midpoints of all the spans in one pass
+        glyphBounds = self.model.scaledGlyphBounds
+        contourBounds = self._contourBounds
+        spans = []
+        for sx, sy, ex, ey in self._measurements:
+            sx, sy, ex, ey = sx - ox, sy - oy, ex - ox, ey - oy
+
+            # lines that miss the glyph's bounding box, or every contour's, can't intersect it
+            if lineMissesBounds(sx, sy, ex, ey, glyphBounds):
+                continue
+            if contourBounds is not None and all(lineMissesBounds(sx, sy, ex, ey, bounds) for bounds in contourBounds):
+                continue
+
+            l = (sx, sy), (ex, ey)
+            i = [(px + ox, py + oy) for px, py in sorted(intersect(scaledGlyph, l))]
+            # each consecutive pair of intersections is a span, like RoboFont's own measurements
+            spans.extend(zip(i, i[1:]))
+
+        # The layers are pooled: existing ones are moved, missing ones are added
+        # and the ones that aren't needed anymore are hidden instead of rebuilding the whole layer
+        sublayers = self._measurementSublayers
+        imageSettings = self._measurementImageSettings
+        textColor = self._textColor
+        appendSymbol = self._measurementsLayer.appendSymbolSublayer
+        appendText = self._measurementsLayer.appendTextLineSublayer
+        while len(sublayers) < len(spans):
+            sublayers.append([
+                appendSymbol(imageSettings=imageSettings),
+                appendSymbol(imageSettings=imageSettings),
+                appendText(
+                    size=(20, 20),
+                    pointSize=8,
+                    weight="bold",
+                    text="",
+                    fillColor=textColor,
+                    horizontalAlignment="center",
+                    verticalAlignment="center",
+                ),
+                "",
+            ])
+
+        visibleCount = self._visibleMeasurementCount
+        for index, (layers, (front, back), (midPoint, length)) in enumerate(zip(sublayers, spans, measureSpans(spans))):
+            frontLayer, backLayer, textLayer, text = layers
+            frontLayer.setPosition(front)
+            backLayer.setPosition(back)
+            textLayer.setPosition(midPoint)
+            # moving the glyph usually keeps the lengths, only lay out text that changed
+            newText = f"{length}"
+            if newText != text:
+                textLayer.setText(newText)
+                layers[3] = newText
+            if index >= visibleCount:
+                for layer in layers[:3]:
+                    layer.setVisible(True)
+        for layers in sublayers[len(spans):visibleCount]:
+            for layer in layers[:3]:
+                layer.setVisible(False)
+        self._visibleMeasurementCount = len(spans)
 
     # Panel Callbacks
     #############################################################
@@ -628,112 +953,96 @@ def redrawView(self):
     def glyphNamesTextBoxCallback(self, sender):
         verbosePrint("TransmutorToolController::glyphNamesTextBoxCallback")
         self.model.sourceGlyphName = sender.get()
-        if not self.userHasMovedGlyph and self.model.sourceGlyphName in self.model.currentFont.keys():
-            self.model.offsetX = interpolate(
-                self.model.currentFont[self.model.sourceGlyphName].bounds[0],
-                self.model.currentFont[self.model.sourceGlyphName].bounds[2],
-                self.model.transformOrigin[0])
-            self.model.offsetY = interpolate(
-                self.model.currentFont[self.model.sourceGlyphName].bounds[1],
-                self.model.currentFont[self.model.sourceGlyphName].bounds[3],
-                self.model.transformOrigin[1])
-        self.redrawView()
+        if not self.userHasMovedGlyph and self.model.sourceGlyphName in self.model.currentFont:
+            sourceBounds = self.model.currentFont[self.model.sourceGlyphName].bounds
+            if sourceBounds is not None:
+                self.model.offsetX, self.model.offsetY = interpolateBounds(sourceBounds, self.model.transformOrigin)
+        # fires on every keystroke, coalesce like the sliders
+        self.scheduleRedraw()
 
     def sourceFontTableEditCallback(self, sender):
         verbosePrint("TransmutorToolController::sourceFontTableEditCallback")
+        # fonts are compared by identity, RFont equality and hashing go through the wrapped font
         items = self.w.getItemValue("sourceFontTable")
-        for i, item in enumerate(items):
-            if item["selected"]:
-                if self.model.allFonts[i] not in self.model.activeFonts:
-                    self.model.activeFonts.append(self.model.allFonts[i])
-            else:
-                if self.model.allFonts[i] in self.model.activeFonts:
-                    self.model.activeFonts.remove(self.model.allFonts[i])
+        selectedIds = {id(self.model.allFonts[i]) for i, item in enumerate(items) if item["selected"]}
+        if selectedIds == {id(font) for font in self.model.activeFonts}:
+            return
 
+        self.model.activeFonts = [font for font in self.model.allFonts if id(font) in selectedIds]
         self.model.updateScaler()
         self.redrawView()
 
     def stemWtRatioVSliderCallback(self, sender):
         verbosePrint("TransmutorToolController::stemWtRatioVSliderCallback")
+        state = self.model.getState()
+        value = float(sender.get())
+        self.model.stemWtRatioV = value
         if self.constrainStemWtRatioSwitch.get():
-            self.model.stemWtRatioV = float(sender.get())
-            self.model.stemWtRatioH = float(sender.get())
-            self.stemWtRatioHSlider.set(float(sender.get()))
-        else:
-            self.model.stemWtRatioV = float(sender.get())
-
-        self.redrawView()
+            self.model.stemWtRatioH = value
+            self.stemWtRatioHSlider.set(value)
 
-    def stemWtRatioVSliderTextFieldCallback(self, sender):
-        verbosePrint("TransmutorToolController::stemWtRatioVSliderTextFieldCallback")
-        if self.constrainStemWtRatioSwitch.get():
-            self.model.stemWtRatioV = float(sender.get())
-            self.model.stemWtRatioH = float(sender.get())
-            self.stemWtRatioHSlider.set(float(sender.get()))
-        else:
-            self.model.stemWtRatioV = float(sender.get())
+        if self.model.getState() != state:
+            self.scheduleRedraw()
 
-        self.redrawView()
+    stemWtRatioVSliderTextFieldCallback = stemWtRatioVSliderCallback
 
     def stemWtRatioHSliderCallback(self, sender):
         verbosePrint("TransmutorToolController::stemWtRatioHSliderCallback")
+        state = self.model.getState()
         self.model.stemWtRatioH = float(sender.get())
-        self.redrawView()
+        if self.model.getState() != state:
+            self.scheduleRedraw()
 
-    def stemWtRatioHSliderTextFieldCallback(self, sender):
-        verbosePrint("TransmutorToolController::stemWtRatioHSliderTextFieldCallback")
-        self.model.stemWtRatioH = float(sender.get())
-        self.redrawView()
+    stemWtRatioHSliderTextFieldCallback = stemWtRatioHSliderCallback
 
     def constrainStemWtRatioSwitchCallback(self, sender):
         verbosePrint("TransmutorToolController::constrainStemWtRatioSwitchCallback")
         if self.constrainStemWtRatioSwitch.get():
             self.stemWtRatioHSlider.enable(False)
-            self.stemWtRatioHSlider.set(float(self.stemWtRatioVSlider.get()))
+            # the model has to follow too, the sliders are only refreshed when the model changes
+            value = float(self.stemWtRatioVSlider.get())
+            self.model.stemWtRatioH = value
+            self.stemWtRatioHSlider.set(value)
         else:
             self.stemWtRatioHSlider.enable(True)
 
-        self.redrawView()
+        self.scheduleRedraw()
 
     def scaleVSliderCallback(self, sender):
         verbosePrint("TransmutorToolController::scaleVSliderCallback")
-        self.model.scaleV = float(sender.get())
+        state = self.model.getState()
+        value = float(sender.get())
+        self.model.scaleV = value
         if self.constrainScaleSwitch.get():
-            self.model.scaleH = float(sender.get()) if float(sender.get()) > 0 else 0.0001
-            self.scaleHSlider.set(float(sender.get()))
-
-        self.redrawView()
+            self.model.scaleH = max(value, 0.0001)
+            self.scaleHSlider.set(value)
 
-    def scaleVSliderTextFieldCallback(self, sender):
-        verbosePrint("TransmutorToolController::scaleVSliderTextFieldCallback")
-        self.model.scaleV = float(sender.get())
-        if self.constrainScaleSwitch.get():
-            self.model.scaleH = float(sender.get()) if float(sender.get()) > 0 else 0.0001
-            self.scaleHSlider.set(float(sender.get()))
+        if self.model.getState() != state:
+            self.scheduleRedraw()
 
-        self.redrawView()
+    scaleVSliderTextFieldCallback = scaleVSliderCallback
 
     def scaleHSliderCallback(self, sender):
         verbosePrint("TransmutorToolController::scaleHSliderCallback")
-        scaleH = float(sender.get()) if float(sender.get()) > 0 else 0.0001
-        self.model.scaleH = scaleH
-        self.redrawView()
+        state = self.model.getState()
+        self.model.scaleH = max(float(sender.get()), 0.0001)
+        if self.model.getState() != state:
+            self.scheduleRedraw()
+
+    scaleHSliderTextFieldCallback = scaleHSliderCallback
 
-    def scaleHSliderTextFieldCallback(self, sender):
-        verbosePrint("TransmutorToolController::scaleHSliderTextFieldCallback")
-        scaleH = float(sender.get()) if float(sender.get()) > 0 else 0.0001
-        self.model.scaleH = scaleH
-        self.redrawView()
-        
     def constrainScaleSwitchCallback(self, sender):
         verbosePrint("TransmutorToolController::constrainScaleSwitchCallback")
         if self.constrainScaleSwitch.get():
             self.scaleHSlider.enable(False)
-            self.scaleHSlider.set(float(self.scaleVSlider.get()))
+            # the model has to follow too, the sliders are only refreshed when the model changes
+            value = float(self.scaleVSlider.get())
+            self.model.scaleH = max(value, 0.0001)
+            self.scaleHSlider.set(value)
         else:
             self.scaleHSlider.enable(True)
 
-        self.redrawView()
+        self.scheduleRedraw()
 
     def addToGlyphButtonCallback(self, sender):
         verbosePrint("TransmutorToolController::addToGlyphButtonCallback")
@@ -750,8 +1059,54 @@ def fontDocumentDidBecomeCurrent(self, info):
     def fontDocumentDidOpen(self, info):
         verbosePrint("TransmutorToolController::fontDocumentDidOpen")
         if self.active == True:
+            font = info["font"]
+            if font not in self.model.allFonts:
+                self.model.allFonts.append(font)
+                if font.info.familyName:
+                    self.model.activeFonts.append(font)
+                self.observeFonts()
             self.reset()
 
+    def fontDocumentWillClose(self, info):
+        verbosePrint("TransmutorToolController::fontDocumentWillClose")
+        if self.active == True:
+            font = info["font"]
+            # the memoized font names and stems and the cached engines hold on to the font otherwise
+            clearMemoizeCache()
+            self.model.clearScalerCache()
+            if font in self.model.allFonts:
+                self.model.allFonts.remove(font)
+                self.observeFonts()
+            if font in self.model.activeFonts:
+                self.model.activeFonts.remove(font)
+                self.model.updateScaler()
+            self.redrawView()
+
+    # drawing in one of the fonts changes it on every mouse event, rebuild once the edits settle
+    adjunctFontDidChangeDelay = 0.5
+
+    def adjunctFontDidChange(self, info):
+        verbosePrint("TransmutorToolController::adjunctFontDidChange")
+        if self.active == True:
+            font = info["font"]
+            currentGlyphEdited = self._currentGlyphEdited
+            self._currentGlyphEdited = False
+            # drawing in the current glyph, or adding the scaled glyph to it, doesn't change the engine,
+            # unless it is the source glyph or one of the glyphs the stems are measured on
+            currentGlyph = self.model.currentGlyph
+            if (currentGlyphEdited and currentGlyph is not None and font == self.model.currentFont
+                    and currentGlyph.name != self.model.sourceGlyphName
+                    and currentGlyph.name not in STEM_REFERENCE_GLYPHS):
+                return
+            # a font that isn't active only drops the engines kept for earlier selections
+            if not self.model.invalidateScaler(font):
+                return
+            self.model.updateScaler()
+            # the scaled glyph key doesn't change with the outlines, draw the layers and measurements again
+            self._geometryKey = None
+            self._measurementsKey = None
+            self.redrawView()
+
     def roboFontDidSwitchCurrentGlyph(self, info):
         verbosePrint("TransmutorToolController::roboFontDidSwitchCurrentGlyph")
         if self.active == True:
@@ -767,6 +1122,24 @@ def glyphEditorDidSetGlyph(self, info):
         if self.active == True:
             self.reset()
             
+    def glyphEditorGlyphDidChange(self, info):
+        verbosePrint("TransmutorToolController::glyphEditorGlyphDidChange")
+        # the measurements are read from the glyph again on the next redraw
+        self._measurementsDirty = True
+        # tells adjunctFontDidChange the font changed because of the current glyph
+        self._currentGlyphEdited = True
+
+    def roboFontDidChangePreferences(self, info):
+        verbosePrint("TransmutorToolController::roboFontDidChangePreferences")
+        if self.active == True:
+            self.loadDefaults()
+            # the colors are set when the layers are created
+            self.clearLayers()
+            self.redrawView()
+
+    # switching between light and dark changes the colors without touching the preferences
+    roboFontAppearanceChanged = roboFontDidChangePreferences
+
     def glyphEditorDidKeyDown(self, info):
         verbosePrint("TransmutorToolController::glyphEditorDidKeyDown")
         if self.active == True:
@@ -780,51 +1153,77 @@ def glyphEditorDidMouseDown(self, info):
         verbosePrint("TransmutorToolController::glyphEditorDidMouseDown")
         if self.active:
             global enable
-            enable = deepcopy(getActiveEventTool().__class__.canSelectWithMarque)
+            enable = getActiveEventTool().__class__.canSelectWithMarque
             point = info['lowLevelEvents'][0]['point']
             self.downPt = point
             self.isDragging = False
+            # a click action only lives for one gesture
+            self.clickAction = None
             self._leftMouseAction(point)
 
-    # glyphEditorDidMouseDragDelay = 0
+    # Let the subscriber coalesce drag events that arrive faster than a frame,
+    # lowLevelEvents then holds all of them and only the latest point is used
+    glyphEditorDidMouseDragDelay = REDRAW_DELAY
+
     def glyphEditorDidMouseDrag(self, info):
+        # a coalesced drag can be delivered after the mouse was released
+        if not self.active or self.downPt is None:
+            return
         verbosePrint("TransmutorToolController::glyphEditorDidMouseDrag")
-        if self.active:
-            point = info['lowLevelEvents'][0]['point']
-            self.isDragging = True
-            self._leftMouseAction(point)
+        point = info['lowLevelEvents'][-1]['point']
+        self.isDragging = True
+        self._leftMouseAction(point)
 
     def glyphEditorDidMouseUp(self, info):
         verbosePrint("TransmutorToolController::glyphEditorDidMouseUp")
         if self.active:
             global enable
             point = info['lowLevelEvents'][0]['point']
+            # clickAction is set by this gesture's mouse down and cleared below
+            if self.downPt is not None and self.clickAction and point != self.downPt:
+                # drags are coalesced, the last ones can still be pending,
+                # or a quick gesture ended before the first one was delivered,
+                # finish the drag at the release point so the result doesn't lag behind the mouse
+                self.isDragging = True
+                self._leftMouseAction(point)
             self.downPt = None
             self.isDragging = False
+            self.clickAction = None
             self._leftMouseAction(point)
             getActiveEventTool().__class__.canSelectWithMarque = enable
 
     def glyphEditorDidChangeModifiers(self, info):
+        if not self.active:
+            return
         verbosePrint("TransmutorToolController::glyphEditorDidChangeModifiers")
-        self.optionDown = bool(info["deviceState"]["optionDown"])
-        self.shiftDown = bool(info["deviceState"]["shiftDown"])
+        deviceState = info["deviceState"]
+        self.optionDown = bool(deviceState["optionDown"])
+        self.shiftDown = bool(deviceState["shiftDown"])
         
-    def _ptOnHandle(self, point, handle):
-        hitSize = 10 * (1/CurrentGlyphWindow().getGlyphViewScale())
-        return handle[0]-hitSize+self.model.offsetX < point[0] < handle[0]+hitSize+self.model.offsetX and handle[1]-hitSize+self.model.offsetY < point[1] < handle[1]+hitSize+self.model.offsetY
-
     def _leftMouseAction(self, point, delta=None):
         verbosePrint("TransmutorToolController::_leftMouseAction")
         if self.active:
             global enable, disable
 
             x, y = point
-            scaledGlyph = self.model.getScaledGlyph()
-
-            if scaledGlyph is not None and issubclass(getActiveEventTool().__class__, EditingTool):
+            model = self.model
+            downPt = self.downPt
+            # moving doesn't change the scaled geometry, so this is usually the glyph from the last redraw
+            # and while a move is being dragged it can't be anything else
+            movingDrag = self.isDragging and self.clickAction == "moving"
+            scaledGlyph = model.getLastScaledGlyph(validate=not movingDrag)
+
+            toolClass = getActiveEventTool().__class__
+            if scaledGlyph is not None and issubclass(toolClass, EditingTool):
                 # If the scaled glyph is a live glyph and not none
                 # and the active tool is the EditingTool or a subclass of it
-                if self.downPt:
+
+                # work on local copies of the model state, they are written back together at the end
+                ox, oy, origin, scaleV, scaleH, stemWtRatioV, stemWtRatioH = model.getState()
+                tox, toy = origin
+                b0, b1, b2, b3 = model.scaledGlyphBounds
+
+                if downPt:
                     # if there is a downPt, i.e. it is not a mouseUp action
                     if not self.isDragging:
                         # if the mouse is not dragging, i.e. it is a mouseDown action, figure out where the click happened
@@ -832,148 +1231,44 @@ def _leftMouseAction(self, point, delta=None):
                         self.clickX = 0
                         self.clickY = 0
 
-                        if self._ptOnHandle(point, (scaledGlyph.bounds[0], scaledGlyph.bounds[1])):
-                            # SW Corner
-                            getActiveEventTool().__class__.canSelectWithMarque = disable
-                            self.corner = (0.0, 0.0)
-                            self.model.offsetX += interpolate(scaledGlyph.bounds[0],
-                                                              scaledGlyph.bounds[2],
-                                                              1.0) - interpolate(scaledGlyph.bounds[0],
-                                                                                 scaledGlyph.bounds[2],
-                                                                                 self.model.transformOrigin[0])
-                            self.model.offsetY += interpolate(scaledGlyph.bounds[1],
-                                                              scaledGlyph.bounds[3],
-                                                              1.0) - interpolate(scaledGlyph.bounds[1],
-                                                                                 scaledGlyph.bounds[3],
-                                                                                 self.model.transformOrigin[1])
-                            self.model.transformOrigin = (1.0, 1.0)
-                            self.clickAction = "scaling"
-                        elif self._ptOnHandle(point, (interpolate(scaledGlyph.bounds[0], scaledGlyph.bounds[2], 0.5), scaledGlyph.bounds[1])):
-                            # S center
-                            getActiveEventTool().__class__.canSelectWithMarque = disable
-                            self.corner = (0.5, 0.0)
-                            self.model.offsetX += interpolate(scaledGlyph.bounds[0],
-                                                              scaledGlyph.bounds[2],
-                                                              0.5) - interpolate(scaledGlyph.bounds[0],
-                                                                                 scaledGlyph.bounds[2],
-                                                                                 self.model.transformOrigin[0])
-                            self.model.offsetY += interpolate(scaledGlyph.bounds[1],
-                                                              scaledGlyph.bounds[3],
-                                                              1.0) - interpolate(scaledGlyph.bounds[1],
-                                                                                 scaledGlyph.bounds[3],
-                                                                                 self.model.transformOrigin[1])
-                            self.model.transformOrigin = (0.5, 1.0)
-                            self.clickAction = "scaling"
-                        elif self._ptOnHandle(point, (scaledGlyph.bounds[2], scaledGlyph.bounds[1])):
-                            # SE Corner
-                            getActiveEventTool().__class__.canSelectWithMarque = disable
-                            self.corner = (1.0, 0.0)
-                            self.model.offsetX += interpolate(scaledGlyph.bounds[0],
-                                                              scaledGlyph.bounds[2],
-                                                              0.0) - interpolate(scaledGlyph.bounds[0],
-                                                                                 scaledGlyph.bounds[2],
-                                                                                 self.model.transformOrigin[0])
-                            self.model.offsetY += interpolate(scaledGlyph.bounds[1],
-                                                              scaledGlyph.bounds[3],
-                                                              1.0) - interpolate(scaledGlyph.bounds[1],
-                                                                                 scaledGlyph.bounds[3],
-                                                                                 self.model.transformOrigin[1])
-                            self.model.transformOrigin = (0.0, 1.0)
-                            self.clickAction = "scaling"
-                        elif self._ptOnHandle(point, (scaledGlyph.bounds[2], interpolate(scaledGlyph.bounds[1], scaledGlyph.bounds[3], 0.5))):
-                            # E center
-                            getActiveEventTool().__class__.canSelectWithMarque = disable
-                            self.corner = (1.0, 0.5)
-                            self.model.offsetX += interpolate(scaledGlyph.bounds[0],
-                                                              scaledGlyph.bounds[2],
-                                                              0.0) - interpolate(scaledGlyph.bounds[0],
-                                                                                 scaledGlyph.bounds[2],
-                                                                                 self.model.transformOrigin[0])
-                            self.model.offsetY += interpolate(scaledGlyph.bounds[1],
-                                                              scaledGlyph.bounds[3],
-                                                              0.5) - interpolate(scaledGlyph.bounds[1],
-                                                                                 scaledGlyph.bounds[3],
-                                                                                 self.model.transformOrigin[1])
-                            self.model.transformOrigin = (0.0, 0.5)
-                            self.clickAction = "scaling"
-                        elif self._ptOnHandle(point, (scaledGlyph.bounds[2], scaledGlyph.bounds[3])):
-                            # NE Corner
-                            getActiveEventTool().__class__.canSelectWithMarque = disable
-                            self.corner = (1.0, 1.0)
-                            self.model.offsetX += interpolate(scaledGlyph.bounds[0],
-                                                              scaledGlyph.bounds[2],
-                                                              0.0) - interpolate(scaledGlyph.bounds[0],
-                                                                                 scaledGlyph.bounds[2],
-                                                                                 self.model.transformOrigin[0])
-                            self.model.offsetY += interpolate(scaledGlyph.bounds[1],
-                                                              scaledGlyph.bounds[3],
-                                                              0.0) - interpolate(scaledGlyph.bounds[1],
-                                                                                 scaledGlyph.bounds[3],
-                                                                                 self.model.transformOrigin[1])
-                            self.model.transformOrigin = (0.0, 0.0)
-                            self.clickAction = "scaling"
-                        elif self._ptOnHandle(point, (interpolate(scaledGlyph.bounds[0], scaledGlyph.bounds[2], 0.5), scaledGlyph.bounds[3])):
-                            # N center
-                            getActiveEventTool().__class__.canSelectWithMarque = disable
-                            self.corner = (0.5, 1.0)
-                            self.model.offsetX += interpolate(scaledGlyph.bounds[0],
-                                                              scaledGlyph.bounds[2],
-                                                              0.5) - interpolate(scaledGlyph.bounds[0],
-                                                                                 scaledGlyph.bounds[2],
-                                                                                 self.model.transformOrigin[0])
-                            self.model.offsetY += interpolate(scaledGlyph.bounds[1],
-                                                              scaledGlyph.bounds[3],
-                                                              0.0) - interpolate(scaledGlyph.bounds[1],
-                                                                                 scaledGlyph.bounds[3],
-                                                                                 self.model.transformOrigin[1])
-                            self.model.transformOrigin = (0.5, 0.0)
-                            self.clickAction = "scaling"
-                        elif self._ptOnHandle(point, (scaledGlyph.bounds[0], scaledGlyph.bounds[3])):
-                            # NW Corner
-                            getActiveEventTool().__class__.canSelectWithMarque = disable
-                            self.corner = (0.0, 1.0)
-                            self.model.offsetX += interpolate(scaledGlyph.bounds[0],
-                                                              scaledGlyph.bounds[2],
-                                                              1.0) - interpolate(scaledGlyph.bounds[0],
-                                                                                 scaledGlyph.bounds[2],
-                                                                                 self.model.transformOrigin[0])
-                            self.model.offsetY += interpolate(scaledGlyph.bounds[1],
-                                                              scaledGlyph.bounds[3],
-                                                              0.0) - interpolate(scaledGlyph.bounds[1],
-                                                                                 scaledGlyph.bounds[3],
-                                                                                 self.model.transformOrigin[1])
-                            self.model.transformOrigin = (1.0, 0.0)
+                        # the view can't zoom mid-drag, so the scale is read once per click
+                        invViewScale = 1.0 / CurrentGlyphWindow().getGlyphViewScale()
+                        hitSize = HANDLE_SIZE * invViewScale
+                        self._invDampener = 1.0 / (200 * invViewScale)
+                        handle = None
+                        # the handles sit on the box, a click further than hitSize away from it can't hit one
+                        # compare in glyph coordinates, so the offset is only subtracted once
+                        gx, gy = x - ox, y - oy
+                        if b0 - hitSize < gx < b2 + hitSize and b1 - hitSize < gy < b3 + hitSize:
+                            for name, u, v, hx, hy in model.getHandlePositions():
+                                if abs(gx - hx) < hitSize and abs(gy - hy) < hitSize:
+                                    handle = (u, v)
+                                    break
+
+                        if handle is not None:
+                            # On a handle, scale from the opposite side of the box
+                            u, v = handle
+                            toolClass.canSelectWithMarque = disable
+                            self.corner = (u, v)
+                            origin = (1.0 - u, 1.0 - v)
+                            dx, dy = originShift((b0, b1, b2, b3), (tox, toy), origin)
+                            ox += dx
+                            oy += dy
                             self.clickAction = "scaling"
-                        elif self._ptOnHandle(point, (scaledGlyph.bounds[0], interpolate(scaledGlyph.bounds[1], scaledGlyph.bounds[3], 0.5))):
-                            # W center
-                            getActiveEventTool().__class__.canSelectWithMarque = disable
-                            self.corner = (0.0, 0.5)
-                            self.model.offsetX += interpolate(scaledGlyph.bounds[0],
-                                                              scaledGlyph.bounds[2],
-                                                              1.0) - interpolate(scaledGlyph.bounds[0],
-                                                                                 scaledGlyph.bounds[2],
-                                                                                 self.model.transformOrigin[0])
-                            self.model.offsetY += interpolate(scaledGlyph.bounds[1],
-                                                              scaledGlyph.bounds[3],
-                                                              0.5) - interpolate(scaledGlyph.bounds[1],
-                                                                                 scaledGlyph.bounds[3],
-                                                                                 self.model.transformOrigin[1])
-                            self.model.transformOrigin = (1.0, 0.5)
-                            self.clickAction = "scaling"
-                        elif scaledGlyph.bounds[0]+self.model.offsetX < x < scaledGlyph.bounds[2]+self.model.offsetX and scaledGlyph.bounds[1]+self.model.offsetY < y < scaledGlyph.bounds[3]+self.model.offsetY:
+                        elif b0+ox < x < b2+ox and b1+oy < y < b3+oy:
                             # Inside the box
-                            getActiveEventTool().__class__.canSelectWithMarque = disable
+                            toolClass.canSelectWithMarque = disable
                             if self.optionDown:
                                 self.clickAction = "interpolating"
                             else:
                                 self.clickAction = "moving"
                                 self.userHasMovedGlyph = True
-                                self.clickX = self.downPt[0] - self.model.offsetX
-                                self.clickY = self.downPt[1] - self.model.offsetY
+                                self.clickX = downPt[0] - ox
+                                self.clickY = downPt[1] - oy
                         else:
                             # outside the box, not on one of the handles
                             self.clickAction = None
-                            getActiveEventTool().__class__.canSelectWithMarque = enable
+                            toolClass.canSelectWithMarque = enable
                     else:
                         # if the mouse IS dragging
                         if self.clickAction:
@@ -981,71 +1276,70 @@ def _leftMouseAction(self, point, delta=None):
                             # If there's a click action
                             if self.clickAction == "scaling" and self.corner is not None:
                                 # If the user is scaling
-                                originPt = (
-                                    interpolate(scaledGlyph.bounds[0] + self.model.offsetX, scaledGlyph.bounds[2] + self.model.offsetX, self.model.transformOrigin[0]),
-                                    interpolate(scaledGlyph.bounds[1] + self.model.offsetY, scaledGlyph.bounds[3] + self.model.offsetY, self.model.transformOrigin[1]))
-
-                                unScaledPt = (interpolate(self.model.unScaledGlyphBounds[0], self.model.unScaledGlyphBounds[2], self.corner[0]) + self.model.offsetX,
-                                              interpolate(self.model.unScaledGlyphBounds[1], self.model.unScaledGlyphBounds[3], self.corner[1]) + self.model.offsetY)
+                                # Both the scaled and the unscaled glyph are built with the transform origin at (0, 0),
+                                # so distances from the origin are just glyph coordinates and the offset cancels out
+                                u0, v0, u1, v1 = model.unScaledGlyphBounds
+                                cu, cv = self.corner
 
-                                # get distance from originPt to unScaledPt, in H and V directions
-                                totalDistanceH = (unScaledPt[0] - originPt[0])
-                                totalDistanceV = (unScaledPt[1] - originPt[1])
+                                # get distance from the origin to the unscaled corner, in H and V directions
+                                totalDistanceH = u0 + (u1 - u0) * cu
+                                totalDistanceV = v0 + (v1 - v0) * cv
 
-                                # get distance from originPt to x, y, in H and V directions
-                                currentDistanceH = (x - originPt[0])
-                                currentDistanceV = (y - originPt[1])
+                                # get distance from the origin to x, y, in H and V directions
+                                currentDistanceH = x - ox
+                                currentDistanceV = y - oy
 
-                                if not totalDistanceV:
-                                    scaleV = self.model.scaleV
-                                else:
+                                if totalDistanceV:
                                     scaleV = currentDistanceV/totalDistanceV
-                                    
-                                if not totalDistanceH:
-                                    scaleH = self.model.scaleH
-                                else:
+
+                                if totalDistanceH:
                                     if not self.shiftDown:
                                         scaleH = currentDistanceH/totalDistanceH
                                     else:
                                         scaleH = scaleV
 
-                                self.model.scaleV = scaleV
-                                self.model.scaleH = scaleH
-
                             elif self.clickAction == "moving":
                                 # If the user is moving, change the offset to match the current mouse position relative to the position of the click within the bounds of the glyph
-                                self.model.offsetX = x - self.clickX
-                                self.model.offsetY = y - self.clickY
+                                ox = x - self.clickX
+                                oy = y - self.clickY
                             elif self.clickAction == "interpolating":
                                 # The user held down option, and is interpolating
-                                dampener = 200 * (1/CurrentGlyphWindow().getGlyphViewScale())
-                                altDragDistanceH = min(3, max(-1, (y - self.downPt[1])/dampener))
-                                altDragDistanceV = min(3, max(-1, (x - self.downPt[0])/dampener))
+                                invDampener = self._invDampener
+                                # clamped to -1...3, so the ratios stay within 0...4
+                                dv = (x - downPt[0]) * invDampener
+                                altDragDistanceV = -1.0 if dv < -1.0 else (3.0 if dv > 3.0 else dv)
+                                stemWtRatioV = altDragDistanceV + 1
 
                                 if not self.shiftDown:
-                                    self.model.stemWtRatioH = altDragDistanceV + 1
-                                    self.model.stemWtRatioV = altDragDistanceV + 1
+                                    stemWtRatioH = stemWtRatioV
                                 else:
-                                    self.model.stemWtRatioH = altDragDistanceH + 1
-                                    self.model.stemWtRatioV = altDragDistanceV + 1
+                                    dh = (y - downPt[1]) * invDampener
+                                    altDragDistanceH = -1.0 if dh < -1.0 else (3.0 if dh > 3.0 else dh)
+                                    stemWtRatioH = altDragDistanceH + 1
                 else:
                     # Reset the origin point and offset to defaults
-                    self.model.offsetX += interpolate(scaledGlyph.bounds[0],
-                                                      scaledGlyph.bounds[2],
-                                                      0.5) - interpolate(scaledGlyph.bounds[0],
-                                                                         scaledGlyph.bounds[2],
-                                                                         self.model.transformOrigin[0])
-                    self.model.offsetY += interpolate(scaledGlyph.bounds[1],
-                                                      scaledGlyph.bounds[3],
-                                                      0.5) - interpolate(scaledGlyph.bounds[1],
-                                                                         scaledGlyph.bounds[3],
-                                                                         self.model.transformOrigin[1])
-                    self.model.transformOrigin = (0.5, 0.5)
+                    origin = (0.5, 0.5)
+                    dx, dy = originShift((b0, b1, b2, b3), (tox, toy), origin)
+                    ox += dx
+                    oy += dy
 
-            self.redrawView()
+                if not model.setState(ox, oy, origin, scaleV, scaleH, stemWtRatioV, stemWtRatioH):
+                    return
+
+            self.scheduleRedraw()
 
 
 def main():
+    # The menu item runs this script again every time,
+    # bring the running panel to the front instead of registering a second subscriber
+    running = listRegisteredSubscribers(subscriberClassName=TransmutorToolController.__name__)
+    for subscriber in running:
+        if subscriber.active:
+            subscriber.w.getNSWindow().makeKeyAndOrderFront_(None)
+            return
+    # an instance that was registered without a glyph window never started, replace it
+    for subscriber in running:
+        unregisterRoboFontSubscriber(subscriber)
     registerRoboFontSubscriber(TransmutorToolController)
 
 